@@ -88,7 +88,7 @@ SAFE_SAVE : bool
     or cleaning of the file. If False (default), will use the following options
     when saving:
 
-        garbage=4, deflate=1
+        garbage=3, deflate=1
 
     Included since the more aggressive garbage collection used when SAFE_SAVE is False
     can sometimes cause issues when viewing the pdfs in Adobe (although the pdfs are fine
@@ -101,13 +101,14 @@ image, then the pdf page will be made to fit the image, regardless of its size.
 
 """
 
-import base64
+import collections
 import functools
 import io
 import os
 from pathlib import Path
-import re
+import shutil
 import textwrap
+import threading
 import traceback
 
 import fitz
@@ -132,7 +133,7 @@ SAFE_SAVE = False
 
 if Path(__file__).parent.joinpath('logo.png').is_file():
     with Path(__file__).parent.joinpath('logo.png').open('rb') as fp:
-        LOGO = base64.encodebytes(fp.read())
+        LOGO = fp.read()
 else:
     LOGO = None
 
@@ -142,6 +143,21 @@ try:
     PAPER_SIZES = fitz.paper_sizes()
 except AttributeError:
     PAPER_SIZES = fitz.paperSizes
+# the choices in the settings dialog and the index of each choice
+PAPER_SIZE_NAMES = list(PAPER_SIZES.keys())
+PAPER_SIZE_INDICES = {name: index for index, name in enumerate(PAPER_SIZE_NAMES)}
+FONT_INDICES = {name: index for index, name in enumerate(fitz.Base14_fontnames)}
+
+# the rotations that can be applied to files and their labels within the grid
+ROTATIONS = {0: '0°', -90: '-90° (left)', 90: '90° (right)', 180: '180°'}
+ROTATION_LABELS = list(ROTATIONS.values())
+# the file types whose conversion to pdf does not depend on the settings
+FIXED_LAYOUT_SUFFIXES = frozenset(('.pdf', '.xps', '.oxps'))
+# the document and image file types that pymupdf can open
+DOCUMENT_SUFFIXES = frozenset(('.xps', '.oxps', '.epub', '.htm', '.html', '.xhtml'))
+IMAGE_SUFFIXES = frozenset((
+    '.jpg', '.jpeg', '.jpe', '.jpx', '.jp2', '.png', '.tif', '.tiff', '.svg', '.gif', '.bmp'
+))
 
 
 class SettingsDialog(wx.Dialog):
@@ -208,13 +224,10 @@ class SettingsDialog(wx.Dialog):
         label_4 = wx.StaticText(self, label='Page Layout')
         sizer_6.Add(label_4, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
 
-        paper_sizes = list(PAPER_SIZES.keys())
-        self.page_layout = wx.Choice(self, wx.ID_ANY, choices=paper_sizes)
-        if PAGE_LAYOUT in PAPER_SIZES:
-            selection = paper_sizes.index(PAGE_LAYOUT)
-        else:
-            selection = paper_sizes.index('letter')
-        self.page_layout.SetSelection(selection)
+        self.page_layout = wx.Choice(self, wx.ID_ANY, choices=PAPER_SIZE_NAMES)
+        self.page_layout.SetSelection(
+            PAPER_SIZE_INDICES.get(PAGE_LAYOUT, PAPER_SIZE_INDICES['letter'])
+        )
         sizer_6.Add(self.page_layout, 0, wx.ALIGN_CENTER_VERTICAL, 0)
 
         self.landscape = wx.CheckBox(self, label='Use landscape (makes width > height)')
@@ -235,11 +248,7 @@ class SettingsDialog(wx.Dialog):
         sizer_4.Add(label_2, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
 
         self.font = wx.Choice(self, choices=fitz.Base14_fontnames)
-        if FONT in fitz.Base14_fontnames:
-            selection = fitz.Base14_fontnames.index(FONT)
-        else:
-            selection = fitz.Base14_fontnames.index('Helvetica')
-        self.font.SetSelection(selection)
+        self.font.SetSelection(FONT_INDICES.get(FONT, FONT_INDICES['Helvetica']))
         sizer_4.Add(self.font, 0, wx.ALIGN_CENTER_VERTICAL, 0)
 
         sizer_5 = wx.BoxSizer(wx.HORIZONTAL)
@@ -319,6 +328,10 @@ class PagesGrid(wx.grid.Grid):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
 
+        # the parsed values of each row, so that the cells do not have to be read and parsed
+        self._row_data = []
+        # page editors are shared between cells and are keyed by the total pages
+        self._page_editors = {}
         self.CreateGrid(0, 5)
         self.EnableDragRowSize(False)
         self.HideCol(4)  # column 4 is just to hold the total number of pages
@@ -331,10 +344,17 @@ class PagesGrid(wx.grid.Grid):
 
         attr = wx.grid.GridCellAttr()
         attr.SetAlignment(wx.ALIGN_CENTER, -1)
-        for col in range(1, 4):
+        for col in range(1, 3):
             self.SetColAttr(col, attr)
             attr.IncRef()
 
+        # the rotation choices are the same for every row, so set the editor for the column
+        attr = wx.grid.GridCellAttr()
+        attr.SetAlignment(wx.ALIGN_CENTER, -1)
+        attr.SetEditor(wx.grid.GridCellChoiceEditor(ROTATION_LABELS, False))
+        self.SetColAttr(3, attr)
+        attr.IncRef()
+
         attr = wx.grid.GridCellAttr()
         attr.SetAlignment(wx.ALIGN_CENTER, -1)
         attr.SetReadOnly(True)
@@ -347,6 +367,8 @@ class PagesGrid(wx.grid.Grid):
         self.SetColLabelValue(3, 'Rotation')
         self.SetColLabelValue(4, 'Total Pages')
 
+        self.Bind(wx.grid.EVT_GRID_CELL_CHANGED, self.on_cell_changed)
+
     def add_row(self, file_path, row_index=None):
         """
         Appends a row to the grid with information after opening the given file.
@@ -360,8 +382,75 @@ class PagesGrid(wx.grid.Grid):
             the row to the grid.
 
         """
+        pages = self._open_file(file_path)
+        if pages is None:
+            return
+
+        if row_index is None:
+            row = self.GetNumberRows()
+            self.AppendRows(1)
+        else:
+            row = row_index
+            self.InsertRows(row)
+        self.create_row_default(row, file_path, pages)
+
+    def add_rows(self, file_paths):
+        """
+        Appends a row to the grid for each of the given files.
+
+        All rows are appended at once and the grid is only redrawn after all
+        rows are filled.
+
+        Parameters
+        ----------
+        file_paths : list(str or os.Pathlike)
+            The paths of the pdf files to open and read. Files that cannot be
+            opened are skipped.
+
+        """
+        files = []
+        for file_path in file_paths:
+            pages = self._open_file(file_path)
+            if pages is not None:
+                files.append((file_path, pages))
+        if not files:
+            return
+
+        start_row = self.GetNumberRows()
+        self.BeginBatch()
         try:
-            pdf = get_pdf(file_path)
+            self.AppendRows(len(files))
+            for row, (file_path, pages) in enumerate(files, start_row):
+                self.create_row_default(row, file_path, pages)
+        finally:
+            self.EndBatch()
+
+    def _open_file(self, file_path):
+        """
+        Opens the file and gets its total number of pages.
+
+        Shows an error message if the file cannot be opened.
+
+        Parameters
+        ----------
+        file_path : str or os.Pathlike
+            The path of the pdf file to open and read.
+
+        Returns
+        -------
+        int or None
+            The total number of pages, or None if the file could not be opened.
+
+        Notes
+        -----
+        The document is not kept by the grid, so that merging always uses the current
+        contents of the file. It stays in the cache of get_pdf, so an unchanged file
+        that needed converting is not converted again when merging.
+
+        """
+        try:
+            # finalize=True so that the document can also be used for the final merge
+            pdf = get_pdf(file_path, True)
             if pdf.needs_pass:  # password protected
                 raise ValueError('File is encrypted and cannot be processed')
             pages = len(pdf)
@@ -371,25 +460,13 @@ class PagesGrid(wx.grid.Grid):
                 (f'Problem opening {file_path}\n\nError:\n    {traceback.format_exc()}'),
             ) as dlg:
                 dlg.ShowModal()
-            return
-        finally:
-            try:
-                pdf.close()
-            except Exception:
-                pass
+            return None
 
-        if row_index is None:
-            row = self.GetNumberRows()
-            self.AppendRows(1)
-        else:
-            row = row_index
-            self.InsertRows(row)
-        self.create_row(row, file_path, pages)
+        return pages
 
-    def create_row(self, row, file_path, total_pages, first_page='1',
-                   last_page=None, rotation=None):
+    def create_row_default(self, row, file_path, total_pages):
         """
-        Adds data about a pdf file to a row in the grid.
+        Adds data about a pdf file to a row in the grid using all pages and no rotation.
 
         Note that this function does not handle the actual creation of the row, so
         that must be done before calling this method.
@@ -402,35 +479,94 @@ class PagesGrid(wx.grid.Grid):
             The file path of the pdf file.
         total_pages : int
             The total number of pages in the pdf file.
-        first_page : str or int, optional
-            The first page of the pdf to use; by default '1'.
-        last_page : str or int, optional
-            The last page of the pdf to use. If None, will be set to the last page.
-        rotation : {0, 90, -90, 180}, optional
-            The integer rotation (in degrees) of the pdf file.
 
         """
-        pages = [str(page + 1) for page in range(total_pages)]
-        first_pg = first_page if str(first_page) in pages else pages[0]
-        last_pg = last_page if last_page is not None else pages[-1]
-        rotations = {0: '0°', -90: '-90° (left)', 90: '90° (right)', 180: '180°'}
-        if rotation is None:
-            start_rotation = rotations[0]
-        elif int(rotation) in rotations.keys():
-            start_rotation = rotations[int(rotation)]
-        elif str(rotation) in rotations.values():
-            start_rotation = str(rotation)
-        else:
-            start_rotation = rotations[0]
-
         self.SetCellValue(row, 0, str(file_path))
-        self.SetCellEditor(row, 1, wx.grid.GridCellChoiceEditor(pages, False))
-        self.SetCellValue(row, 1, str(first_pg))
-        self.SetCellEditor(row, 2, wx.grid.GridCellChoiceEditor(pages, False))
-        self.SetCellValue(row, 2, str(last_pg))
-        self.SetCellEditor(row, 3, wx.grid.GridCellChoiceEditor(list(rotations.values()), False))
-        self.SetCellValue(row, 3, start_rotation)
+        self._set_page_editors(row, total_pages)
+        self.SetCellValue(row, 1, '1')
+        self.SetCellValue(row, 2, str(total_pages))
+        self.SetCellValue(row, 3, ROTATIONS[0])
         self.SetCellValue(row, 4, str(total_pages))
+        self._row_data[row] = [str(file_path), 0, total_pages - 1, 0, total_pages]
+
+    def _set_page_editors(self, row, total_pages):
+        """Sets the shared editor for the first and last page cells of a row."""
+        editor = self._page_editors.get(total_pages)
+        if editor is None:
+            # number editors only store the page limits rather than a list of every page
+            editor = wx.grid.GridCellNumberEditor(1, total_pages)
+            self._page_editors[total_pages] = editor
+        for col in (1, 2):
+            editor.IncRef()
+            self.SetCellEditor(row, col, editor)
+
+    def on_cell_changed(self, event):
+        """Updates the stored values of the row after a cell is edited."""
+        row = event.GetRow()
+        col = event.GetCol()
+        if col in (1, 2):
+            self._row_data[row][col] = int(self.GetCellValue(row, col)) - 1
+        elif col == 3:
+            self._row_data[row][3] = int(self.GetCellValue(row, col).split('°')[0])
+        event.Skip()
+
+    def set_rotation(self, row, rotation):
+        """
+        Sets the rotation of a row.
+
+        Parameters
+        ----------
+        row : int
+            The index of the row.
+        rotation : str
+            The rotation string to show in the grid, eg. '90° (right)'.
+
+        """
+        self.SetCellValue(row, 3, rotation)
+        self._row_data[row][3] = int(rotation.split('°')[0])
+
+    def AppendRows(self, numRows=1, updateLabels=True):
+        """Appends rows to the grid and reserves their stored entries."""
+        self._row_data.extend([None] * numRows)
+        return super().AppendRows(numRows, updateLabels)
+
+    def InsertRows(self, pos=0, numRows=1, updateLabels=True):
+        """Inserts rows into the grid and reserves their stored entries."""
+        self._row_data[pos:pos] = [None] * numRows
+        return super().InsertRows(pos, numRows, updateLabels)
+
+    def DeleteRows(self, pos=0, numRows=1, updateLabels=True):
+        """Deletes rows from the grid and their stored entries."""
+        del self._row_data[pos:pos + numRows]
+        return super().DeleteRows(pos, numRows, updateLabels)
+
+    def swap_rows(self, row_a, row_b):
+        """
+        Swaps the contents of two rows in place.
+
+        The page editors are updated along with the values, since they depend on
+        the total number of pages of the file in the row.
+
+        Parameters
+        ----------
+        row_a : int
+            The index of the first row.
+        row_b : int
+            The index of the second row.
+
+        """
+        values_a = [self.GetCellValue(row_a, col) for col in range(5)]
+        values_b = [self.GetCellValue(row_b, col) for col in range(5)]
+        for col, (value_a, value_b) in enumerate(zip(values_a, values_b)):
+            self.SetCellValue(row_a, col, value_b)
+            self.SetCellValue(row_b, col, value_a)
+
+        row_data = self._row_data
+        row_data[row_a], row_data[row_b] = row_data[row_b], row_data[row_a]
+
+        if self._row_data[row_a][4] != self._row_data[row_b][4]:
+            self._set_page_editors(row_a, self._row_data[row_a][4])
+            self._set_page_editors(row_b, self._row_data[row_b][4])
 
     def get_values(self):
         """
@@ -453,17 +589,14 @@ class PagesGrid(wx.grid.Grid):
                 rotations : {0, 90, -90, 180}
                     The integer rotation to apply to the document. Note that -90 will
                     rotate the document left (counter-clockwise).
-        """
-        data = []
-        for row in range(self.GetNumberRows()):
-            data.append([
-                self.GetCellValue(row, 0),
-                int(self.GetCellValue(row, 1)) - 1,
-                int(self.GetCellValue(row, 2)) - 1,
-                int(self.GetCellValue(row, 3).split('°')[0]),
-            ])
 
-        return data
+        Notes
+        -----
+        The values are taken from the stored row values rather than reading
+        and parsing each cell of the grid.
+
+        """
+        return [row_data[:4] for row_data in self._row_data]
 
 
 class PDFMerger(wx.Frame):
@@ -486,8 +619,15 @@ class PDFMerger(wx.Frame):
         super().__init__(parent, **kwargs)
         self.SetSize(self.FromDIP((900, 500)))
         self.preview = None
-        if LOGO is not None:
-            self.SetIcon(wx.Icon(wx.Image(io.BytesIO(base64.b64decode(LOGO))).ConvertToBitmap()))
+        self.merged_pdf = None  # the last saved merged pdf and the key from get_merge_key
+        self.preview_pdf = None  # the last preview's pdf bytes and the key from get_merge_key
+        # the progress dialog and its message while merging or saving on a separate thread
+        self.progress = None
+        self.progress_message = ''
+        self.progress_timer = wx.Timer(self)
+        logo = get_logo_icon()
+        if logo is not None:
+            self.SetIcon(logo)
 
         self.menubar = wx.MenuBar()
         self.options_menu = wx.Menu('Set Options')
@@ -564,6 +704,73 @@ class PDFMerger(wx.Frame):
         self.save_btn.Bind(wx.EVT_BUTTON, self.on_save)
         self.preview_btn.Bind(wx.EVT_BUTTON, self.on_preview)
         self.Bind(wx.EVT_MENU, self.set_options, self.menubar)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_TIMER, self.on_progress_timer, self.progress_timer)
+
+    def on_close(self, event):
+        """Closes the merged pdf and clears the document cache before closing."""
+        self.clear_merged_pdf()
+        clear_pdf_cache()
+        event.Skip()
+
+    def get_merge_key(self, finalize):
+        """
+        Returns the values that identify a merged pdf.
+
+        Like get_pdf, the modification time and size of each file are included along
+        with the grid values and `finalize`, so that a merged pdf is not reused after
+        any of its files change.
+
+        """
+        key = []
+        for row_data in self.grid.get_values():
+            try:
+                file_stats = os.stat(row_data[0])
+                file_info = (file_stats.st_mtime_ns, file_stats.st_size)
+            except OSError:
+                file_info = None
+            key.append((*row_data, file_info))
+        return (tuple(key), finalize)
+
+    def get_merge_inputs(self, finalize, key=None):
+        """
+        Gets the inputs for merging the files in the grid on a separate thread.
+
+        Parameters
+        ----------
+        finalize : bool
+            See merge_pdfs.
+        key : tuple, optional
+            The key from get_merge_key for `finalize`, if it was already made.
+
+        Returns
+        -------
+        key : tuple
+            The key from get_merge_key, which identifies the merged pdf.
+        source : fitz.Document or list
+            The last saved pdf if it was made with the same key, so that repeated
+            saves of unchanged files do not have to merge all of the files again. Otherwise, the grid values to give to merge_pdfs.
+
+        """
+        if key is None:
+            key = self.get_merge_key(finalize)
+        if self.merged_pdf is not None and self.merged_pdf[0] == key:
+            return key, self.merged_pdf[1]
+
+        self.clear_merged_pdf()
+        return key, self.grid.get_values()
+
+    def set_merged_pdf(self, key, output_pdf):
+        """Stores the merged pdf so that it can be reused. The pdf is owned by the frame."""
+        if self.merged_pdf is not None and self.merged_pdf[1] is not output_pdf:
+            self.clear_merged_pdf()
+        self.merged_pdf = (key, output_pdf)
+
+    def clear_merged_pdf(self):
+        """Closes the stored merged pdf so that the next merge is done from scratch."""
+        if self.merged_pdf is not None:
+            self.merged_pdf[1].close()
+            self.merged_pdf = None
 
     def set_options(self, event):
         """
@@ -581,15 +788,23 @@ class PDFMerger(wx.Frame):
                 reset_grid = True
 
         if reset_grid:
+            # files other than pdf and xps depend on the settings, so have to
+            # convert and merge them again
+            self.clear_merged_pdf()
+            self.preview_pdf = None
+            clear_pdf_cache()
             grid_data = self.grid.get_values()
-            rotations = {0: '0°', -90: '-90° (left)', 90: '90° (right)', 180: '180°'}
-            for row, row_data in enumerate(grid_data):
-                suffix = Path(row_data[0]).suffix.lower()
-                if re.search('.*xps|pdf', suffix) is None:
-                    self.grid.DeleteRows(row)
-                    self.grid.add_row(row_data[0], row)
-                    if is_image(suffix):
-                        self.grid.SetCellValue(row, 3, rotations[row_data[3]])
+            self.grid.BeginBatch()
+            try:
+                for row, row_data in enumerate(grid_data):
+                    suffix = Path(row_data[0]).suffix.lower()
+                    if suffix not in FIXED_LAYOUT_SUFFIXES:
+                        self.grid.DeleteRows(row)
+                        self.grid.add_row(row_data[0], row)
+                        if is_image(suffix):
+                            self.grid.set_rotation(row, ROTATIONS[row_data[3]])
+            finally:
+                self.grid.EndBatch()
         event.Skip()
 
     def on_add(self, event):
@@ -605,54 +820,54 @@ class PDFMerger(wx.Frame):
         ) as dialog:
             if dialog.ShowModal() == wx.ID_OK:
                 # maybe not necessary, but ensures paths are correct for all os
-                paths = [str(Path(path)) for path in dialog.GetPaths()]
-        for path in paths:
-            self.grid.add_row(path)
+                paths = [os.path.normpath(path) for path in dialog.GetPaths()]
+        self.grid.add_rows(paths)
 
     def on_remove(self, event):
         """Removes selected files from the grid."""
-        rows = self.grid.GetSelectedRows()
-        for row in reversed(rows):
-            self.grid.DeleteRows(row)
-        self.grid.ClearSelection()
+        # group the selected rows into blocks of consecutive rows that are deleted at once
+        blocks = []
+        for row in sorted(self.grid.GetSelectedRows()):
+            if blocks and row == blocks[-1][0] + blocks[-1][1]:
+                blocks[-1][1] += 1
+            else:
+                blocks.append([row, 1])
+
+        self.grid.BeginBatch()
+        try:
+            # delete from the end so that the indices of the other blocks do not change
+            for start_row, num_rows in reversed(blocks):
+                self.grid.DeleteRows(start_row, num_rows)
+            self.grid.ClearSelection()
+        finally:
+            self.grid.EndBatch()
 
     def _move(self, move_down=False):
         """Moves all selected grid rows up or down, if possible."""
-        rows = self.grid.GetSelectedRows()
+        rows = sorted(self.grid.GetSelectedRows(), reverse=move_down)
         if not rows:
             return
-        self.grid.ClearSelection()
-        failed_moves = []
-        if move_down:
-            new_row = lambda x: x + 2
-            old_row = lambda x: x
-            select_row = lambda x: x + 1
-            failed_row = lambda x: x + 1
-            rows = sorted(rows, reverse=True)
-            if rows[0] == self.grid.GetNumberRows() - 1:
-                failed_moves.append(rows.pop(0) + 1)
-        else:
-            new_row = lambda x: x - 1
-            old_row = lambda x: x + 1
-            select_row = lambda x: x - 1
-            failed_row = lambda x: x
-            if rows[0] == 0:
-                failed_moves.append(rows.pop(0))
-
-        grid_data = self.grid.get_values()
-        for row in rows:
-            if new_row(row) in failed_moves:
-                failed_moves.append(failed_row(row))
-                continue
-
-            self.grid.InsertRows(new_row(row))
-            file_path, first_pg, last_pg, rotation = grid_data[row]
-            self.grid.create_row(
-                new_row(row), file_path, int(self.grid.GetCellValue(old_row(row), 4)),
-                first_pg + 1, last_pg + 1, rotation
-            )
-            self.grid.DeleteRows(old_row(row))
-            self.grid.SelectRow(select_row(row), True)
+        step = 1 if move_down else -1
+        # the first row that a selected row cannot move into
+        limit = self.grid.GetNumberRows() if move_down else -1
+        new_selection = []
+        # batch all changes so the grid is only redrawn once
+        self.grid.BeginBatch()
+        try:
+            for row in rows:
+                if row + step == limit:
+                    limit = row
+                    new_selection.append(row)
+                else:
+                    self.grid.swap_rows(row, row + step)
+                    new_selection.append(row + step)
+
+            # the selection can be non-contiguous, so cannot use a single SelectBlock
+            self.grid.ClearSelection()
+            for row in new_selection:
+                self.grid.SelectRow(row, True)
+        finally:
+            self.grid.EndBatch()
 
     def move_up(self, event):
         """Moves all selected grid rows up, if possible."""
@@ -683,7 +898,9 @@ class PDFMerger(wx.Frame):
         """
         Merges the selected pdfs and saves.
 
-        The frame is closed if the merged pdf is saved successfully.
+        The merging and saving are done on a separate thread while a progress dialog is shown.
+        If the only file is a pdf that is used without changes, it is copied instead.
+        The output file name is cleared if the merged pdf is saved successfully.
 
         """
         event.Skip()
@@ -700,21 +917,147 @@ class PDFMerger(wx.Frame):
                 dlg.ShowModal()
             return
 
+        # a single pdf file that is used without changes is just copied
+        file_path, first_pg, last_pg, rotation = grid_data[0]
+        copy_file = (
+            len(grid_data) == 1 and is_pdf_file(file_path) and rotation == 0
+            and first_pg == 0
+            and os.path.realpath(file_path) != os.path.realpath(output_path)
+        )
+        if copy_file:
+            # the file may have changed since it was added, so check its current page
+            # count; if it cannot be opened, merging will report the error
+            try:
+                copy_file = last_pg == len(get_pdf(file_path, True)) - 1
+            except Exception:
+                copy_file = False
+        if copy_file:
+            self.start_progress('Saving', 'Copying the file...')
+            threading.Thread(
+                target=self._copy_pdf, args=(file_path, output_path), daemon=True
+            ).start()
+            return
+
+        key, source = self.get_merge_inputs(True)
+
+        # note: garbate > 2 will merge the same objects, which can cause issues viewing
+        # the pdf with Adobe (although the pdf can still be viewed with other software)
+        if SAFE_SAVE:
+            save_options = {}
+        else:
+            # garbage=3 already merges duplicate objects; the stream comparison of
+            # garbage=4 takes a lot of time for little size benefit
+            save_options = {'garbage': 3, 'deflate': 1}
+
+        self.start_progress('Saving', 'Merging the files...')
+        threading.Thread(
+            target=self._save_pdf, args=(key, source, output_path, save_options), daemon=True
+        ).start()
+
+    def start_progress(self, title, message):
+        """
+        Shows an app-modal progress dialog while work is done on a separate thread.
+
+        The dialog makes the gui unusable, so that the grid and the documents cannot
+        be changed while they are used by the other thread, and an open preview is
+        paused until stop_progress is called. Note that the gui still freezes while
+        pymupdf holds the GIL, such as while saving a document.
+
+        Parameters
+        ----------
+        title : str
+            The title of the dialog.
+        message : str
+            The initial message of the dialog.
+
+        """
+        self.progress_message = message
+        if self.preview:
+            # the viewer also uses pymupdf, which cannot be used from two threads at once
+            self.preview.pause()
+        self.progress = wx.ProgressDialog(
+            title, message, parent=self, style=wx.PD_APP_MODAL | wx.PD_ELAPSED_TIME
+        )
+        self.progress_timer.Start(100)
+
+    def stop_progress(self):
+        """Closes the progress dialog and resumes any open preview."""
+        self.progress_timer.Stop()
+        if self.progress is not None:
+            self.progress.Destroy()
+            self.progress = None
+        if self.preview:
+            self.preview.resume()
+
+    def on_progress_timer(self, event):
+        """Pulses the progress dialog and updates its message."""
+        if self.progress is not None:
+            self.progress.Pulse(self.progress_message)
+
+    def _save_pdf(self, key, source, output_path, save_options):
+        """
+        Merges the files if needed and saves the merged pdf.
+
+        Is called on a separate thread, so the gui is only updated through wx.CallAfter.
+
+        Parameters
+        ----------
+        key : tuple
+            The key for the merged pdf from get_merge_inputs.
+        source : fitz.Document or list
+            The merged pdf or the grid values to merge from get_merge_inputs.
+        output_path : str
+            The file path to save the pdf to.
+        save_options : dict
+            Keyword arguments for fitz.Document.save.
+
+        """
+        error = None
+        output_pdf = None
         try:
-            output_pdf = merge_pdfs(grid_data, True)
+            if isinstance(source, fitz.Document):
+                output_pdf = source
+            else:
+                output_pdf = merge_pdfs(source, True)
             if len(output_pdf) == 0:
                 raise ValueError('The output pdf has no pages.')
-            # note: garbate > 2 will merge the same objects, which can cause issues viewing
-            # the pdf with Adobe (although the pdf can still be viewed with other software)
-            if SAFE_SAVE:
-                save_options = {}
-            else:
-                save_options = {'garbage': 4, 'deflate': 1}
+
+            self.progress_message = 'Saving the merged file...'
             output_pdf.save(output_path, **save_options)
         except Exception:
+            error = traceback.format_exc()
+        wx.CallAfter(self._on_save_finished, key, output_pdf, output_path, error)
+
+    def _copy_pdf(self, file_path, output_path):
+        """
+        Copies a pdf file to the output path.
+
+        Is called on a separate thread, so the gui is only updated through wx.CallAfter.
+
+        Parameters
+        ----------
+        file_path : str
+            The file path of the pdf to copy.
+        output_path : str
+            The file path to copy the pdf to.
+
+        """
+        error = None
+        try:
+            shutil.copyfile(file_path, output_path)
+        except Exception:
+            error = traceback.format_exc()
+        wx.CallAfter(self._on_save_finished, None, None, output_path, error)
+
+    def _on_save_finished(self, key, output_pdf, output_path, error):
+        """Closes the progress dialog and shows the result of saving."""
+        self.stop_progress()
+        if output_pdf is not None:
+            self.set_merged_pdf(key, output_pdf)
+
+        if error is not None:
             with wx.MessageDialog(
-                self, f'Could not save file\n\n    {traceback.format_exc()}',
-                'Error Saving'
+                self, f'Could not save file\n\n    {error}', 'Error Saving'
             ) as dlg:
                 dlg.ShowModal()
         else:
@@ -724,35 +1067,74 @@ class PDFMerger(wx.Frame):
             ) as dlg:
                 dlg.ShowModal()
             self.output_file.SetValue('')
-        finally:
-            try:
-                output_pdf.close()
-            except Exception:
-                pass
 
     def on_preview(self, event):
-        """Launches the pdf viewer to show a preview."""
-        grid_values = self.grid.get_values()
-        if self.preview or not grid_values:
+        """Merges the files on a separate thread and then launches the pdf viewer."""
+        if self.preview or not self.grid.GetNumberRows():
             return
 
+        key = self.get_merge_key(False)
+        # reuse the last preview if the grid and its files have not changed since it was made
+        if self.preview_pdf is not None:
+            if self.preview_pdf[0] == key:
+                self.show_preview(self.preview_pdf[1])
+                return
+            self.preview_pdf = None  # release the outdated preview before merging again
+
+        self.start_progress('Preview', 'Merging the files...')
+        threading.Thread(
+            target=self._make_preview, args=(key, self.grid.get_values()), daemon=True
+        ).start()
+
+    def _make_preview(self, key, grid_data):
+        """
+        Merges the files and serializes the merged pdf for the preview.
+
+        Is called on a separate thread, so the gui is only updated through wx.CallAfter.
+
+        Parameters
+        ----------
+        key : tuple
+            The key from get_merge_key for the preview.
+        grid_data : list
+            The grid values to give to merge_pdfs.
+
+        Notes
+        -----
+        Only the bytes are kept for reusing the preview, so the merged pdf is closed
+        once it is serialized.
+
+        """
+        error = None
+        pdf_bytes = None
         try:
-            temp_pdf = merge_pdfs(grid_values)
+            output_pdf = merge_pdfs(grid_data, False)
+            try:
+                # serialize once so the viewer can directly parse the bytes
+                pdf_bytes = pdf_to_bytes(output_pdf)
+            finally:
+                output_pdf.close()
         except Exception:
+            error = traceback.format_exc()
+        wx.CallAfter(self._on_preview_finished, key, pdf_bytes, error)
+
+    def _on_preview_finished(self, key, pdf_bytes, error):
+        """Closes the progress dialog and shows the preview."""
+        self.stop_progress()
+        if error is not None:
             with wx.MessageDialog(
-                self, f'Could not make preview\n\n    {traceback.format_exc()}',
-                'Error with preview'
+                self, f'Could not make preview\n\n    {error}', 'Error with preview'
             ) as dlg:
                 dlg.ShowModal()
-            temp_pdf = None
             return
 
-        self.preview = PDFViewer(self, temp_pdf, title='PDF Preview')
+        self.preview_pdf = (key, pdf_bytes)
+        self.show_preview(pdf_bytes)
+
+    def show_preview(self, pdf_bytes):
+        """Launches the pdf viewer to show the merged pdf."""
+        self.preview = PDFViewer(self, pdf_bytes, title='PDF Preview')
         self.preview.Show()
-        try:
-            temp_pdf.close()
-        except ValueError:
-            pass
 
 
 def merge_pdfs(grid_data, finalize=False):
@@ -782,77 +1164,142 @@ def merge_pdfs(grid_data, finalize=False):
         merged table of contents.
 
     """
+    # each file is only opened once, even if it is used for several entries or
+    # is given using different paths
+    keys = [os.path.realpath(entry[0]) for entry in grid_data]
+
     current_pg = 0
     output_file = fitz.Document()
     total_toc = []  # collects the bookmarks from all of the files
-    for file_path, first_pg, last_pg, rotation in grid_data:
-        path = Path(file_path)
+    sources = {}  # the opened document and its total pages for each file path
+    for index, (file_path, first_pg, last_pg, rotation) in enumerate(grid_data):
+        key = keys[index]
+        if key not in sources:
+            # use finalize=True like PagesGrid so that the document opened when the file
+            # was added is reused; links and bookmarks are still skipped if not finalize.
+            # Documents from get_pdf are cached, so they are not closed
+            document = get_pdf(file_path, True)
+            sources[key] = (document, len(document))
+        temp_file, pages = sources[key]
+
+        # ensures pages are within the document
+        first_pg = min(max(0, first_pg), pages - 1)
+        if last_pg != -1:
+            last_pg = min(max(0, last_pg), pages - 1)
+        else:
+            last_pg = pages - 1
 
-        with get_pdf(path, finalize) as temp_file:
-            pages = len(temp_file)
+        # only add unencrypted files
+        if not temp_file.needs_pass:
+            output_file.insert_pdf(
+                temp_file, from_page=first_pg, to_page=last_pg, rotate=rotation,
+                links=finalize, annots=True
+            )
+            # empty MuPDF's object store and stored warnings after each file so
+            # that memory use does not keep growing when merging many files
+            fitz.TOOLS.store_shrink(100)
+            fitz.TOOLS.mupdf_warnings(reset=True)
+        else:
+            print(
+                f'\nThe following file is encrypted and cannot be processed:\n\n    {file_path}'
+            )
+            continue
 
-            # ensures pages are within the document
-            first_pg = min(max(0, first_pg), pages - 1)
-            if last_pg != -1:
-                last_pg = min(max(0, last_pg), pages - 1)
-            else:
-                last_pg = pages - 1
+        if not finalize:
+            continue  # skip creating the table of contents
 
-            # only add unencrypted files
-            if not temp_file.needs_pass:
-                output_file.insert_pdf(
-                    temp_file, from_page=first_pg, to_page=last_pg,
-                    rotate=rotation, links=finalize, annots=True
-                )
-            else:
-                print(
-                    f'\nThe following file is encrypted and cannot be processed:\n\n    {str(path)}'
+        # get file's table of contents
+        toc = temp_file.get_toc(simple=False)
+
+        if first_pg > last_pg:
+            increment = -1
+            toc = reversed(toc)  # iterate backwards rather than copying the list
+        else:
+            increment = 1
+
+        pg_count = abs(last_pg - first_pg) + 1
+
+        # the position of each goto bookmark's page within the page range, which is
+        # outside of [0, pg_count) if the page was not added; None means it is not
+        # a goto bookmark
+        indexed_links = (
+            (
+                link,
+                (link[2] - 1 - first_pg) * increment
+                if link[3]["kind"] == fitz.LINK_GOTO else None
+            )
+            for link in toc
+        )
+        # skip named links since pymupdf cannot process them, and skip
+        # bookmarks that are not within the page range
+        bookmarks = [
+            (link, index) for link, index in indexed_links
+            if (index is None or 0 <= index < pg_count)
+            and link[3]["kind"] != fitz.LINK_NAMED
+        ]
+
+        # set starting bookmark level to 1
+        last_lvl = 1
+        for link, index in bookmarks:
+            if index is not None:
+                page_num = index + current_pg + 1
+
+                # fix bookmark levels left by filler bookmarks
+                total_toc.extend(
+                    [level, "<>", page_num, link[3]]
+                    for level in range(last_lvl + 1, link[0])
                 )
-                continue
+                last_lvl = link[0]
+                link[2] = page_num
+            total_toc.append(link)
 
-            if not finalize:
-                continue  # skip creating the table of contents
+        current_pg += pg_count
 
-            # get file's table of contents
-            toc = temp_file.get_toc(simple=False)
-            if first_pg > last_pg:
-                increment = -1
-                toc = toc[::-1]
-            else:
-                increment = 1
+    if total_toc:
+        output_file.set_toc(total_toc)
 
-            pg_range = list(range(first_pg, last_pg + increment, increment))
+    return output_file
 
-            # set starting bookmark level to 1
-            last_lvl = 1
-            for link in toc:
-                lnk_type = link[3]["kind"]
 
-                if lnk_type == fitz.LINK_NAMED:
-                    # skip named links since pymupdf cannot process them
-                    continue
-                elif lnk_type == fitz.LINK_GOTO:
-                    if link[2] - 1 not in pg_range:
-                        # skip the bookmark if it's not within the page range
-                        continue
-                    else:
-                        page_num = pg_range.index(link[2] - 1) + current_pg + 1
+def is_pdf_file(file_path):
+    """
+    Determines if the input is the path to a pdf file.
 
-                        # fix bookmark levels left by filler bookmarks
-                        while (link[0] > last_lvl + 1):
-                            total_toc.append([last_lvl + 1, "<>", page_num, link[3]])
-                            last_lvl += 1
+    Parameters
+    ----------
+    file_path : str or os.Pathlike
+        The file path to check.
 
-                        last_lvl = link[0]
-                        link[2] = page_num
-                total_toc.append(link)
+    Returns
+    -------
+    bool
+        True if `file_path` is a path with a .pdf extension.
 
-            current_pg += len(pg_range)
+    """
+    return os.fspath(file_path).lower().endswith('.pdf')
 
-    if total_toc:
-        output_file.set_toc(total_toc)
 
-    return output_file
+def pdf_to_bytes(pdf):
+    """
+    Serializes a pymupdf Document to bytes.
+
+    Parameters
+    ----------
+    pdf : fitz.Document
+        The document to serialize. No garbage collection or compression is done
+        so that the serialization is fast.
+
+    Returns
+    -------
+    bytes
+        The document as a pdf byte string.
+
+    """
+    # fitz.Document.write was changed to .tobytes in pymupdf v1.18.7
+    if hasattr(pdf, 'tobytes'):
+        return pdf.tobytes()
+    else:
+        return pdf.write()
 
 
 def get_page_layout():
@@ -863,6 +1310,24 @@ def get_page_layout():
     return page_layout
 
 
+@functools.lru_cache(maxsize=None)
+def get_logo_icon():
+    """
+    Creates the icon for the frames from the logo.
+
+    The icon is only created once, and a wx.App must exist before it is created.
+
+    Returns
+    -------
+    wx.Icon or None
+        The icon, or None if there is no logo.
+
+    """
+    if LOGO is None:
+        return None
+    return wx.Icon(wx.Image(io.BytesIO(LOGO)).ConvertToBitmap())
+
+
 def get_pdf(file_name, finalize=False):
     """
     Generates a pymupdf Document based on the file extension of the file.
@@ -880,15 +1345,38 @@ def get_pdf(file_name, finalize=False):
     fitz.Document
         The file converted to a pymupdf Document using the appropriate conversions.
 
+    Notes
+    -----
+    The documents are cached, keyed by the file's resolved path, modification
+    time, and size, so that opening the same unchanged file again does not have
+    to parse or convert it again. Since the documents can be shared, they should not be
+    closed by the caller; use clear_pdf_cache to release them.
+
     """
-    path = Path(file_name)
-    suffix = path.suffix.lower()
-    if suffix.startswith('.'):
-        suffix = suffix[1:]
+    # resolve the path so that different paths to the same file share a document
+    file_path = os.path.realpath(file_name)
+    file_stats = os.stat(file_path)
+    return _get_cached_pdf(file_path, file_stats.st_mtime_ns, file_stats.st_size, finalize)
+
+
+def clear_pdf_cache():
+    """Clears the cached documents from get_pdf, eg. after the conversion settings change."""
+    _get_cached_pdf.cache_clear()
+
 
-    if suffix == 'pdf':
+@functools.lru_cache(maxsize=64)
+def _get_cached_pdf(file_name, modified_time, file_size, finalize):
+    """
+    Generates a pymupdf Document based on the file extension of the file.
+
+    `modified_time` and `file_size` are only used so that the cache is not
+    used if the file changes. See get_pdf for the other parameters.
+
+    """
+    suffix = Path(file_name).suffix.lower()
+    if suffix == '.pdf':
         return fitz.Document(file_name)
-    elif re.search('.*xps|epub|htm.*', suffix) is not None:
+    elif suffix in DOCUMENT_SUFFIXES:
         return document_to_pdf(file_name, finalize)
     elif is_image(suffix):
         return image_to_pdf(file_name)
@@ -918,18 +1406,24 @@ def document_to_pdf(file_name, finalize=False):
     htm* and epub files are sized according to PAGE_LAYOUT and FONT_SIZE since
     their size can be variable.
 
+    The converted document must be a pdf, since fitz.Document.insert_pdf only
+    accepts pdf documents as the source.
+
     """
     path = Path(file_name)
     width, height = fitz.PaperSize(get_page_layout())
-    with fitz.Document(str(path), width=width, height=height, fontsize=FONT_SIZE) as original:
-        pdf = fitz.Document(filetype='pdf', stream=original.convert_to_pdf())
-        if finalize:
-            pdf.set_toc(original.get_toc())
+    with fitz.Document(path, width=width, height=height, fontsize=FONT_SIZE) as original:
+        toc = original.get_toc() if finalize else None
+        stream = original.convert_to_pdf()
+    # the original is closed before the pdf is parsed so that both are not in memory at once
+    pdf = fitz.Document(filetype='pdf', stream=stream)
+    if finalize:
+        pdf.set_toc(toc)
 
     return pdf
 
 
-def text_to_pdf(file_name):
+def text_to_pdf(file_name, encoding='utf-8'):
     """
     Converts text files to pdf.
 
@@ -937,6 +1431,9 @@ def text_to_pdf(file_name):
     ----------
     file_name : str or os.Pathlike
         The file path for the text document.
+    encoding : str, optional
+        The encoding of the text file. Default is 'utf-8'. Characters that cannot
+        be decoded are replaced rather than raising an error.
 
     Returns
     -------
@@ -958,39 +1455,63 @@ def text_to_pdf(file_name):
     # is 20% of the font size, above and below; should be just 1.2,
     # but 1.4 works better.
     page_lines = int((height - 108) / (1.4 * FONT_SIZE))
-    # estimate character width using 0 as the average character
     # 100 is the left and right margins, 50 points each by default
-    max_chars = int((width - 100) / fitz.Font(FONT, FONT_PATH).text_length('0', FONT_SIZE))
-    line_count = 0
-    page_buffer = ''
+    max_chars = int((width - 100) / get_character_width(FONT, FONT_PATH, FONT_SIZE))
+    wrapper = textwrap.TextWrapper(width=max_chars, subsequent_indent='\n')
+    page_buffer = []  # the lines of the current page, joined once the page is full
 
     pdf = fitz.Document()
-    with open(file_name) as text_file:
+    # the file is read once from start to end, so use a large buffer to reduce reads
+    with open(file_name, encoding=encoding, errors='replace', buffering=2**20) as text_file:
         for item in text_file:
             if len(item) > max_chars:
-                line_list = textwrap.wrap(item, width=max_chars, subsequent_indent='\n')
+                line_list = wrapper.wrap(item)
                 line_list[-1] += '\n'
             else:
                 line_list = [item]
             for line in line_list:
-                page_buffer += line
-                line_count += 1
-                if line_count >= page_lines:
+                page_buffer.append(line)
+                if len(page_buffer) >= page_lines:
                     pdf.insert_page(
-                        -1, text=page_buffer, fontsize=FONT_SIZE,
+                        -1, text=''.join(page_buffer), fontsize=FONT_SIZE,
                         width=width, height=height, fontname=FONT, fontfile=FONT_PATH
                     )
-                    line_count = 0
-                    page_buffer = ''
+                    page_buffer.clear()
         if page_buffer:
             pdf.insert_page(
-                -1, text=page_buffer, fontsize=FONT_SIZE,
+                -1, text=''.join(page_buffer), fontsize=FONT_SIZE,
                 width=width, height=height, fontname=FONT, fontfile=FONT_PATH
             )
 
     return pdf
 
 
+@functools.lru_cache(maxsize=None)
+def get_character_width(font_name, font_path, font_size):
+    """
+    Estimates the average character width of a font.
+
+    The width is cached so that the font does not have to be loaded again
+    for each converted file.
+
+    Parameters
+    ----------
+    font_name : str
+        The name of the font. See FONT.
+    font_path : str or None
+        The file path of the font. See FONT_PATH.
+    font_size : int
+        The font size.
+
+    Returns
+    -------
+    float
+        The width of the character '0', which is used as the average character.
+
+    """
+    return fitz.Font(font_name, font_path).text_length('0', font_size)
+
+
 def image_to_pdf(file_name):
     """
     Converts image files to pdf.
@@ -1017,11 +1538,23 @@ def image_to_pdf(file_name):
     """
     path = Path(file_name)
     stream = None
-    with fitz.Document(str(path)) as doc:
-        image_rect = doc[0].rect
-        if 'svg' in path.suffix:
+    if 'svg' in path.suffix:
+        with fitz.Document(path) as doc:
+            image_rect = doc[0].rect
             # have to convert svg to pdf since pymupdf cannot use svg as a Pixmap
             stream = doc.convert_to_pdf()
+    else:
+        # read the file once and get its size from the image header rather than decoding
+        # the image both here and when it is inserted
+        image_data = path.read_bytes()
+        image_info = fitz.image_profile(image_data)
+        if not image_info:
+            raise ValueError(f'{path} is not a valid image file')
+        image_width = image_info['width'] * 72 / image_info['xres']
+        image_height = image_info['height'] * 72 / image_info['yres']
+        if image_info['transform'][0] == 0:  # the image's orientation rotates it 90 degrees
+            image_width, image_height = image_height, image_width
+        image_rect = fitz.Rect(0, 0, image_width, image_height)
 
     if EXPAND_IMAGES or FULL_PAGE_IMAGES:
         width, height = fitz.PaperSize(get_page_layout())
@@ -1055,7 +1588,7 @@ def image_to_pdf(file_name):
         with fitz.Document(filetype='pdf', stream=stream) as image_pdf:
             page.show_pdf_page(rect, image_pdf, 0)
     else:
-        page.insert_image(rect, filename=str(path))
+        page.insert_image(rect, stream=image_data)
 
     return pdf
 
@@ -1078,10 +1611,67 @@ def is_image(file_suffix):
 
     Notes
     -----
-    Supported extensions are jpg/jpeg/jpx, png, tif/tiff, svg, gif, and bmp.
+    Supported extensions are jpg/jpeg/jpe/jpx/jp2, png, tif/tiff, svg, gif, and bmp.
 
     """
-    return re.search('jp.*|png|tif.*|svg|gif|bmp', file_suffix) is not None
+    if not file_suffix.startswith('.'):
+        file_suffix = '.' + file_suffix
+    return file_suffix.lower() in IMAGE_SUFFIXES
+
+
+class PageCanvas(wx.Window):
+    """
+    A window that draws a single bitmap, used to display rendered pages.
+
+    Replacing the bitmap only stores it and repaints the window, rather than
+    updating a native image control like wx.StaticBitmap.SetBitmap does.
+
+    Parameters
+    ----------
+    parent : wx.Window
+        The parent widget for the window.
+    **kwargs
+        Any additional keyword arguments for initializing wx.Window.
+
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.bitmap = wx.NullBitmap
+        # the whole window is drawn in on_paint, so the background is not erased
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+
+    def AcceptsFocus(self):
+        """Leaves focus with the parent so that its key bindings keep working."""
+        return False
+
+    def on_paint(self, event):
+        """Draws the bitmap at the top-left of the window."""
+        dc = wx.AutoBufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+        if self.bitmap.IsOk():
+            dc.DrawBitmap(self.bitmap, 0, 0)
+
+    def set_bitmap(self, bitmap):
+        """
+        Sets the bitmap to draw and resizes the window to fit it.
+
+        Parameters
+        ----------
+        bitmap : wx.Bitmap
+            The bitmap to draw.
+
+        Notes
+        -----
+        The parent's layout must be updated afterwards for the new size to be used.
+
+        """
+        self.bitmap = bitmap
+        self.SetMinSize(bitmap.GetSize())
+        self.InvalidateBestSize()
+        self.Refresh(False)
 
 
 class PDFViewer(wx.Frame):
@@ -1092,7 +1682,7 @@ class PDFViewer(wx.Frame):
     ----------
     parent : wx.Window
         The parent widget for the frame.
-    pdf : str or io.BytesIO or os.Pathlike or fitz.Document
+    pdf : str or bytes or io.BytesIO or os.Pathlike or fitz.Document
         The file or buffer stream to display.
     **kwargs
         Any additional keyword arguments for initializing wx.Frame.
@@ -1107,10 +1697,18 @@ class PDFViewer(wx.Frame):
         self.pdf = self.load_pdf(pdf)
         self._total_pages = len(self.pdf)
         self._last_v_scroll = -1  # used to track vertical scrolling
-        self._redraw = False
-
-        if LOGO is not None:
-            self.SetIcon(wx.Icon(wx.Image(io.BytesIO(base64.b64decode(LOGO))).ConvertToBitmap()))
+        self._paused = False  # True while pymupdf is being used on another thread
+        # redraws the page once resizing stops
+        self._resize_timer = wx.Timer(self)
+        self._pixmap = None  # reused for rendering pages with the same size
+        # the DisplayList and rect of rendered pages, in order of last use
+        self._displaylists = collections.OrderedDict()
+        # the rendered bitmaps for each page and zoom, in order of last use
+        self._bitmaps = collections.OrderedDict()
+
+        logo = get_logo_icon()
+        if logo is not None:
+            self.SetIcon(logo)
 
         self.main_panel = wx.Panel(self)
         sizer_1 = wx.BoxSizer(wx.VERTICAL)
@@ -1185,7 +1783,7 @@ class PDFViewer(wx.Frame):
         sizer_1.Add(self.display_panel, 1, wx.ALL | wx.EXPAND, 0)
 
         sizer_3 = wx.BoxSizer(wx.HORIZONTAL)
-        self.pdf_bitmap = wx.StaticBitmap(self.display_panel)
+        self.pdf_bitmap = PageCanvas(self.display_panel)
         sizer_3.Add(self.pdf_bitmap, 1)
         self.render_page(1)
         self.display_panel.SetSizer(sizer_3)
@@ -1208,6 +1806,7 @@ class PDFViewer(wx.Frame):
         self.pg_input.Bind(wx.EVT_KILL_FOCUS, self.go_to_page)
         self.Bind(wx.EVT_CLOSE, self.on_close)
         self.Bind(wx.EVT_SIZE, self.on_resize)
+        self.Bind(wx.EVT_TIMER, self.on_resize_timer, self._resize_timer)
         self.Bind(wx.EVT_IDLE, self.on_idle)
 
     def set_focus(self, event=None):
@@ -1238,25 +1837,64 @@ class PDFViewer(wx.Frame):
                 event.Skip()
 
     def on_idle(self, event):
-        """Redraws the image once sizing is completed."""
-        if self._redraw:
-            self.render_page(self.current_pg)
-            self._redraw = False
+        """Prefetches the pages next to the current page."""
+        if self.pdf is not None and not self._paused:
+            # build the DisplayList for the next and previous pages (which wrap around)
+            # so that changing pages is faster; only one is built per idle event so
+            # that user input is not delayed
+            next_pages = (
+                self.current_pg % self._total_pages + 1,
+                (self.current_pg - 2) % self._total_pages + 1
+            )
+            for page in next_pages:
+                if page not in self._displaylists:
+                    self.get_displaylist(page)
+                    event.RequestMore()
+                    break
         event.Skip()
 
     def on_resize(self, event):
         """Queues up a redraw of the pdf if zoom level is set to fit page or width."""
-        if not self._redraw and self.zoom_level <= 0:
-            self._redraw = True
+        if self.zoom_level <= 0:
+            # restart the timer for each resize so that only one redraw is done
+            # after the window stops being resized
+            self._resize_timer.StartOnce(80)
         event.Skip()
 
+    def on_resize_timer(self, event):
+        """Redraws the page after the window is resized if the zoom changed."""
+        if self.pdf is None or self.zoom_level > 0 or self._paused:
+            return
+        # eg. changing only the height does not change the zoom when fitting the width
+        zoom = self.get_fit_zoom(self.get_displaylist(self.current_pg)[1])
+        if zoom != self.matrix.a or zoom != self.matrix.d:
+            self.render_page(self.current_pg)
+
+    def pause(self):
+        """
+        Stops the frame from using pymupdf until resume is called.
+
+        pymupdf does not support multithreading, so this should be called before
+        pymupdf is used on another thread. User input is expected to be blocked
+        separately, eg. by an app-modal dialog, so only the idle prefetching and
+        the redraws after resizing are stopped.
+
+        """
+        self._paused = True
+        self._resize_timer.Stop()
+
+    def resume(self):
+        """Allows the frame to use pymupdf again and redraws the page if it was resized."""
+        self._paused = False
+        self.on_resize_timer(None)
+
     def load_pdf(self, pdf):
         """
         Creates a pymupdf Document for viewing.
 
         Parameters
         ----------
-        pdf : str or io.BytesIO or os.Pathlike or fitz.Document
+        pdf : str or bytes or io.BytesIO or os.Pathlike or fitz.Document
             The file or buffer stream to display.
 
         Returns
@@ -1271,11 +1909,7 @@ class PDFViewer(wx.Frame):
 
         """
         if isinstance(pdf, fitz.Document):
-            # fitz.Document.write was changes to .tobytes in pymupdf v1.18.7
-            if hasattr(pdf, 'tobytes'):
-                stream = io.BytesIO(pdf.tobytes())
-            else:
-                stream = io.BytesIO(pdf.write())
+            stream = pdf_to_bytes(pdf)
             file_name = 'pdf'
         elif isinstance(pdf, (str, os.PathLike)):
             file_name = str(Path(pdf))
@@ -1287,13 +1921,13 @@ class PDFViewer(wx.Frame):
 
         return fitz.Document(file_name, stream)
 
-    @functools.lru_cache(maxsize=500)
     def get_displaylist(self, page):
         """
         Gets the DisplayList for the given page.
 
         Results are cached so that repeated lookups are faster (The DisplayLists
-        do not require much memory to cache).
+        do not require much memory to cache). The 500 most recently used pages
+        are kept.
 
         Parameters
         ----------
@@ -1302,11 +1936,22 @@ class PDFViewer(wx.Frame):
 
         Returns
         -------
-        fitz.DisplayList
+        displaylist : fitz.DisplayList
             The DisplayList for the page.
+        rect : fitz.Rect
+            The rectangle of the page.
 
         """
-        return self.pdf[page - 1].get_displaylist()
+        entry = self._displaylists.get(page)
+        if entry is not None:
+            self._displaylists.move_to_end(page)
+            return entry
+
+        displaylist = self.pdf[page - 1].get_displaylist()
+        entry = self._displaylists[page] = (displaylist, displaylist.rect)
+        if len(self._displaylists) > 500:
+            self._displaylists.popitem(last=False)
+        return entry
 
     def render_page(self, page, reset_scroll=False):
         """
@@ -1322,29 +1967,23 @@ class PDFViewer(wx.Frame):
 
         Notes
         -----
-        If the zoom level is set to fit the page, then the zoom matrix
-        is recalculated for each page.
+        If the zoom level is set to fit the page, then the zoom is recalculated
+        for each page, and the zoom matrix is only replaced if the zoom changed.
+        Fixed zoom levels use the matrix set by _zoom.
 
         Use self.Freeze to not update the frame while changing pages so
         that the transition is much smoother, and then call self.Thaw.
 
         """
+        displaylist, area = self.get_displaylist(page)
         if self.zoom_level <= 0:
-            area = self.get_displaylist(page).rect
-            height = area.height
-            width = area.width
-            display_area = self.display_panel.GetSize()
-            if self.zoom_level == 0:
-                zoom = min(display_area[0] / width, display_area[1] / height)
-            else:
-                # give a little space for a possible scrollbar
-                zoom = (display_area[0] - self.FromDIP(25)) / width
-            self.matrix = fitz.Matrix(zoom, zoom)
+            zoom = self.get_fit_zoom(area)
+            # pages with the same size keep using the same matrix
+            if zoom != self.matrix.a or zoom != self.matrix.d:
+                self.matrix = fitz.Matrix(zoom, zoom)
 
         self.Freeze()
-        pixmap = self.get_displaylist(page).getPixmap(matrix=self.matrix, alpha=False)
-        self.pdf_bitmap.SetBitmap(wx.Bitmap.FromBuffer(pixmap.w, pixmap.h, pixmap.samples))
-        pixmap = None
+        self.pdf_bitmap.set_bitmap(self.get_bitmap(page, displaylist, area))
 
         self.main_panel.Layout()  # updates the display_panel's scrollbars
         # update scrollbar position
@@ -1368,6 +2007,99 @@ class PDFViewer(wx.Frame):
 
         self.Thaw()
 
+    def get_bitmap(self, page, displaylist, page_rect):
+        """
+        Gets the bitmap of a page with the current zoom.
+
+        Bitmaps are cached so that going back to a page or zoom level does not
+        have to render the page again. The most recently used bitmaps are kept,
+        up to about 100 MB.
+
+        Parameters
+        ----------
+        page : int
+            The page to render. Is 1-indexed.
+        displaylist : fitz.DisplayList
+            The DisplayList of the page.
+        page_rect : fitz.Rect
+            The rectangle of the page.
+
+        Returns
+        -------
+        wx.Bitmap
+            The rendered page.
+
+        """
+        # the matrix includes the zoom for fitting the page or width to the display
+        key = (page, round(self.matrix.a, 4), round(self.matrix.d, 4))
+        bitmap = self._bitmaps.get(key)
+        if bitmap is not None:
+            self._bitmaps.move_to_end(key)
+            return bitmap
+
+        pixmap = self.render_pixmap(displaylist, page_rect)
+        bitmap = wx.Bitmap.FromBuffer(pixmap.w, pixmap.h, pixmap.samples_mv)
+        self._bitmaps[key] = bitmap
+        # estimate 4 bytes per pixel since bitmaps can be stored with an alpha channel
+        total_size = sum(bmp.GetWidth() * bmp.GetHeight() * 4 for bmp in self._bitmaps.values())
+        while total_size > 100e6 and len(self._bitmaps) > 1:
+            old_bitmap = self._bitmaps.popitem(last=False)[1]
+            total_size -= old_bitmap.GetWidth() * old_bitmap.GetHeight() * 4
+        return bitmap
+
+    def get_fit_zoom(self, page_rect):
+        """
+        Calculates the zoom for fitting the page or page width to the display.
+
+        Parameters
+        ----------
+        page_rect : fitz.Rect
+            The rectangle of the page.
+
+        Returns
+        -------
+        float
+            The zoom for the current zoom level, which should be 0 (fit page)
+            or -1 (fit width).
+
+        """
+        display_area = self.display_panel.GetSize()
+        if self.zoom_level == 0:
+            return min(display_area[0] / page_rect.width, display_area[1] / page_rect.height)
+        else:
+            # give a little space for a possible scrollbar
+            return (display_area[0] - self.FromDIP(25)) / page_rect.width
+
+    def render_pixmap(self, displaylist, page_rect):
+        """
+        Renders a page with the current zoom.
+
+        Parameters
+        ----------
+        displaylist : fitz.DisplayList
+            The DisplayList of the page to render.
+        page_rect : fitz.Rect
+            The rectangle of the page.
+
+        Returns
+        -------
+        fitz.Pixmap
+            The rendered page, without transparency.
+
+        Notes
+        -----
+        The same pixmap is reused while the rendered size does not change, so that
+        a new image buffer does not have to be made for each render. The pixmap is
+        only valid until the next render.
+
+        """
+        area = page_rect * self.matrix
+        if self._pixmap is None or self._pixmap.irect != area.irect:
+            self._pixmap = fitz.Pixmap(fitz.csRGB, area.irect, False)
+        self._pixmap.clear_with(255)  # white background, same as get_pixmap without alpha
+        displaylist.run(fitz.Device(self._pixmap, None), self.matrix, area)
+        return self._pixmap
+
     def go_to_page(self, event):
         """Goes to the page specified by the user, if it is valid."""
         try:
@@ -1503,15 +2235,17 @@ class PDFViewer(wx.Frame):
         """
         Cleans up everything associated with the window before closing.
 
-        Closes the fitz.Document and clears the DisplayList cache.
+        Clears the DisplayList and bitmap caches and then closes the fitz.Document,
+        so that no DisplayList outlives the document it was made from.
 
         """
-        try:
+        self._resize_timer.Stop()
+        self._pixmap = None
+        self._displaylists.clear()
+        self._bitmaps.clear()
+        if self.pdf is not None:
             self.pdf.close()
-        except Exception:
-            pass  # the fitz.Document was already closed
-        self.pdf = None
-        self.get_displaylist.cache_clear()
+            self.pdf = None
         event.Skip()
 
 